@@ -0,0 +1,3 @@
+"""
+Набор бенчмарков производительности RAG системы
+"""
@@ -0,0 +1,144 @@
+"""
+Локальная заглушка API ГигаЧат для бенчмарков
+
+Реализует два эндпоинта, которые использует GigaChatClient:
+получение токена (/api/v2/oauth) и генерацию ответа (/api/v1/chat/completions).
+Задержка ответа настраивается, чтобы моделировать время работы модели.
+"""
+
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional
+
+AUTH_PATH = "/api/v2/oauth"
+CHAT_PATH = "/api/v1/chat/completions"
+STUB_ANSWER = "Ответ заглушки ГигаЧат для бенчмарка."
+
+
+class _StubHandler(BaseHTTPRequestHandler):
+    def do_POST(self):
+        """Обработка POST запросов клиента ГигаЧат"""
+        length = int(self.headers.get("Content-Length", 0))
+        self.rfile.read(length)
+
+        if self.path == AUTH_PATH:
+            self._send_json({
+                "access_token": "stub-access-token",
+                "expires_at": int(time.time() * 1000) + 30 * 60 * 1000
+            })
+        elif self.path == CHAT_PATH:
+            self.server.sleep()
+            self._send_json({
+                "choices": [
+                    {
+                        "message": {
+                            "role": "assistant",
+                            "content": STUB_ANSWER
+                        },
+                        "index": 0,
+                        "finish_reason": "stop"
+                    }
+                ],
+                "model": "GigaChat-stub",
+                "object": "chat.completion"
+            })
+        else:
+            self.send_error(404)
+
+    def _send_json(self, payload: dict):
+        """Отправка JSON ответа"""
+        body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        """Отключаем логирование каждого запроса"""
+        pass
+
+
+class _StubServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address, latency_ms: float, jitter_ms: float, seed: int):
+        super().__init__(address, _StubHandler)
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def sleep(self):
+        """Имитация задержки генерации ответа"""
+        with self._lock:
+            jitter = self._random.uniform(-self.jitter_ms, self.jitter_ms) if self.jitter_ms else 0.0
+        time.sleep(max(0.0, self.latency_ms + jitter) / 1000)
+
+
+class GigaChatStub:
+    """Заглушка ГигаЧат, запускаемая в фоновом потоке"""
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0,
+                 latency_ms: float = 0.0, jitter_ms: float = 0.0, seed: int = 0):
+        self.host = host
+        self.port = port
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.seed = seed
+        self._server: Optional[_StubServer] = None
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        """Адрес для config.GIGACHAT_BASE_URL"""
+        return f"http://{self.host}:{self.port}/api/v1"
+
+    @property
+    def auth_url(self) -> str:
+        """Адрес для config.GIGACHAT_AUTH_URL"""
+        return f"http://{self.host}:{self.port}{AUTH_PATH}"
+
+    def start(self) -> "GigaChatStub":
+        """Запуск сервера"""
+        self._server = _StubServer((self.host, self.port), self.latency_ms, self.jitter_ms, self.seed)
+        self.port = self._server.server_address[1]
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """Остановка сервера"""
+        if self._server:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def __enter__(self) -> "GigaChatStub":
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Локальная заглушка API ГигаЧат")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="задержка ответа, мс")
+    parser.add_argument("--jitter-ms", type=float, default=0.0, help="разброс задержки, мс")
+    args = parser.parse_args()
+
+    stub = GigaChatStub(args.host, args.port, args.latency_ms, args.jitter_ms).start()
+    print(f"🤖 Заглушка ГигаЧат запущена")
+    print(f"  GIGACHAT_BASE_URL={stub.base_url}")
+    print(f"  GIGACHAT_AUTH_URL={stub.auth_url}")
+    try:
+        stub._thread.join()
+    except KeyboardInterrupt:
+        stub.stop()
@@ -0,0 +1,357 @@
+#!/usr/bin/env python3
+"""
+Бенчмарк производительности RAG системы
+
+Измеряет на реальных документах и синтетических корпусах (x10, x100):
+- скорость загрузки (фрагментов в секунду) и время холодного старта
+- пиковое потребление памяти (RSS)
+- задержку поиска и полного запроса RAGSystem.query() (p50/p95/p99)
+
+ГигаЧат заменяется локальной заглушкой с настраиваемой задержкой.
+Каждый масштаб измеряется в отдельном процессе, результаты сохраняются
+в JSON для сравнения запусков.
+
+Пример:
+    python -m benchmarks.run_benchmarks --scales 1,10,100 --llm-latency-ms 800
+    python -m benchmarks.run_benchmarks --compare benchmarks/results/old.json
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+SOURCE_DOCUMENTS_DIR = ROOT_DIR / "data" / "documents"
+CORPORA_DIR = ROOT_DIR / "benchmarks" / ".corpora"
+RESULTS_DIR = ROOT_DIR / "benchmarks" / "results"
+
+DEFAULT_QUERIES = [
+    "Какие специалисты работают в студии на Арбате?",
+    "Сколько бесплатных услуг может получить клиент?",
+    "Как работают сертификаты?",
+    "Какие дополнительные услуги доступны?",
+    "Информация о кератиновом выпрямлении",
+    "Какие бренды красок используются в студиях?",
+    "Кто из мастеров делает окрашивание в Нижнем Новгороде?",
+    "Какие партнерские сертификаты есть у Гинзы?",
+]
+
+# Допустимое отклонение числа прочитанных фрагментов от ожидаемого роста корпуса
+SCALE_TOLERANCE = 0.9
+
+# Метрики, которые выводятся при сравнении запусков
+COMPARED_METRICS = [
+    "cold_start_seconds",
+    "ingest_chunks_per_second",
+    "peak_rss_mb",
+    "duplicate_chunks",
+    "dedup_seconds",
+    "search_latency_ms.p50",
+    "search_latency_ms.p95",
+    "search_latency_ms.p99",
+    "query_latency_ms.p50",
+    "query_latency_ms.p95",
+    "query_latency_ms.p99",
+]
+
+
+def expected_csv_rows(corpus_dir: Path) -> int:
+    """Число строк во всех CSV файлах корпуса: каждая строка - отдельный фрагмент"""
+    from table_reader import read_table
+
+    return sum(len(read_table(csv_file)[3]) for csv_file in corpus_dir.glob("*.csv"))
+
+
+def percentiles(samples: List[float]) -> Dict[str, float]:
+    """Расчет p50/p95/p99 по выборке"""
+    if not samples:
+        return {"p50": 0.0, "p95": 0.0, "p99": 0.0, "mean": 0.0, "count": 0}
+    if len(samples) == 1:
+        cuts = [float(samples[0])] * 99
+    else:
+        cuts = statistics.quantiles(samples, n=100, method="inclusive")
+    return {
+        "p50": round(cuts[49], 3),
+        "p95": round(cuts[94], 3),
+        "p99": round(cuts[98], 3),
+        "mean": round(statistics.fmean(samples), 3),
+        "count": len(samples)
+    }
+
+
+def peak_rss_mb() -> float:
+    """Пиковое потребление памяти текущим процессом, МБ"""
+    import resource
+
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # На macOS значение в байтах, на Linux - в килобайтах
+    if sys.platform == "darwin":
+        return round(peak / (1024 * 1024), 1)
+    return round(peak / 1024, 1)
+
+
+async def _measure(corpus_dir: Path, queries: List[str], iterations: int, warmup: int) -> Dict[str, Any]:
+    """Измерения внутри отдельного процесса"""
+    started = time.perf_counter()
+
+    # Импорт входит во время холодного старта
+    import config
+    from rag_system import RAGSystem
+
+    config.DOCUMENTS_DIR = corpus_dir
+    rag_system = RAGSystem()
+    await rag_system.initialize()
+    cold_start = time.perf_counter() - started
+
+    stats = await rag_system.get_stats()
+
+    # Проверяем, что все строки CSV файлов корпуса действительно загружены
+    source_chunks = stats.get("source_chunks", stats["total_chunks"])
+    csv_rows = expected_csv_rows(corpus_dir)
+    if stats["csv_chunks"] != csv_rows:
+        raise RuntimeError(
+            f"Из CSV файлов {corpus_dir} загружено {stats['csv_chunks']} фрагментов при {csv_rows} строках"
+        )
+
+    from benchmarks.gigachat_stub import STUB_ANSWER
+
+    for question in queries[:warmup]:
+        await rag_system.query(question)
+
+    # GigaChatClient возвращает текст ошибки вместо исключения, поэтому проверяем ответ заглушки
+    response = await rag_system.query(queries[0])
+    if response["answer"] != STUB_ANSWER:
+        raise RuntimeError(f"Ответ получен не от заглушки ГигаЧат: {response['answer']}")
+
+    search_latencies = []
+    query_latencies = []
+    for _ in range(iterations):
+        for question in queries:
+            t = time.perf_counter()
+            await rag_system.document_search.search(query=question, limit=config.TOP_K_RETRIEVAL)
+            search_latencies.append((time.perf_counter() - t) * 1000)
+
+            t = time.perf_counter()
+            await rag_system.query(question)
+            query_latencies.append((time.perf_counter() - t) * 1000)
+
+    # Пропускная способность считается по прочитанным фрагментам, до схлопывания дубликатов
+    ingest_seconds = stats.get("ingest_seconds") or 0.0
+    return {
+        "total_documents": stats["total_documents"],
+        "total_chunks": stats["total_chunks"],
+        "cold_start_seconds": round(cold_start, 3),
+        "ingest_seconds": round(ingest_seconds, 3),
+        "index_seconds": round(stats.get("index_seconds") or 0.0, 3),
+        "ingest_chunks_per_second": round(source_chunks / ingest_seconds, 1) if ingest_seconds else 0.0,
+        "indexed_chunks_per_second": round(stats["total_chunks"] / ingest_seconds, 1) if ingest_seconds else 0.0,
+        "source_chunks": source_chunks,
+        "csv_chunks": stats["csv_chunks"],
+        "expected_csv_rows": csv_rows,
+        "duplicate_chunks": stats.get("duplicate_chunks", 0),
+        "dedup_seconds": round(stats.get("dedup_seconds") or 0.0, 3),
+        "embedding_seconds_saved": round(stats.get("embedding_seconds_saved") or 0.0, 3),
+        "peak_rss_mb": peak_rss_mb(),
+        "search_latency_ms": percentiles(search_latencies),
+        "query_latency_ms": percentiles(query_latencies)
+    }
+
+
+def run_worker(args) -> int:
+    """Точка входа дочернего процесса"""
+    result = asyncio.run(_measure(Path(args.corpus), load_queries(args.queries_file), args.iterations, args.warmup))
+    Path(args.worker_output).write_text(json.dumps(result, ensure_ascii=False), encoding="utf-8")
+    return 0
+
+
+def load_queries(queries_file: Optional[str]) -> List[str]:
+    """Загрузка списка вопросов: по одному в строке"""
+    if not queries_file:
+        return list(DEFAULT_QUERIES)
+    lines = Path(queries_file).read_text(encoding="utf-8").splitlines()
+    return [line.strip() for line in lines if line.strip()]
+
+
+def run_scale(scale: int, corpus_dir: Path, stub, args) -> Dict[str, Any]:
+    """Запуск измерений для одного масштаба корпуса в отдельном процессе"""
+    env = dict(os.environ)
+    env["GIGACHAT_BASE_URL"] = stub.base_url
+    env["GIGACHAT_AUTH_URL"] = stub.auth_url
+    env.setdefault("GIGACHAT_TOKEN", "stub-token")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        output = Path(tmp) / "result.json"
+        command = [
+            sys.executable, "-m", "benchmarks.run_benchmarks", "--worker",
+            "--corpus", str(corpus_dir),
+            "--worker-output", str(output),
+            "--iterations", str(args.iterations),
+            "--warmup", str(args.warmup),
+        ]
+        if args.queries_file:
+            command += ["--queries-file", str(Path(args.queries_file).resolve())]
+
+        started = time.perf_counter()
+        completed = subprocess.run(command, cwd=ROOT_DIR, env=env)
+        process_seconds = time.perf_counter() - started
+
+        if completed.returncode != 0 or not output.exists():
+            raise RuntimeError(f"Бенчмарк для масштаба x{scale} завершился с кодом {completed.returncode}")
+
+        result = json.loads(output.read_text(encoding="utf-8"))
+
+    result["scale"] = scale
+    result["process_seconds"] = round(process_seconds, 3)
+    return result
+
+
+def check_scaling(result: Dict[str, Any], previous: List[Dict[str, Any]]):
+    """Проверка, что число прочитанных фрагментов растет вместе с масштабом корпуса"""
+    base = next((r for r in previous if r["scale"] == 1), None)
+    if not base or result["scale"] == 1:
+        return
+
+    expected = base["source_chunks"] * result["scale"]
+    if result["source_chunks"] < expected * SCALE_TOLERANCE:
+        raise RuntimeError(
+            f"Корпус x{result['scale']} загружен не полностью: "
+            f"{result['source_chunks']} фрагментов при ожидаемых ~{expected}"
+        )
+
+
+def _git_commit() -> Optional[str]:
+    """Текущий коммит репозитория, если доступен"""
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=ROOT_DIR, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _metric(result: Dict[str, Any], name: str) -> Optional[float]:
+    """Получение метрики по имени вида 'query_latency_ms.p95'"""
+    value: Any = result
+    for key in name.split("."):
+        if not isinstance(value, dict) or key not in value:
+            return None
+        value = value[key]
+    return value
+
+
+def compare(previous: Dict[str, Any], current: Dict[str, Any]):
+    """Вывод сравнения двух запусков"""
+    previous_by_scale = {r["scale"]: r for r in previous.get("results", [])}
+
+    print(f"\n📈 Сравнение с запуском {previous.get('started_at')} (коммит {previous.get('git_commit')})")
+    for result in current["results"]:
+        old = previous_by_scale.get(result["scale"])
+        if not old:
+            continue
+        print(f"\n  Масштаб x{result['scale']}:")
+        for name in COMPARED_METRICS:
+            old_value, new_value = _metric(old, name), _metric(result, name)
+            if old_value is None or new_value is None:
+                continue
+            delta = f"{(new_value - old_value) / old_value * 100:+.1f}%" if old_value else "n/a"
+            print(f"    {name:<28} {old_value:>12} -> {new_value:<12} ({delta})")
+
+
+def print_result(result: Dict[str, Any]):
+    """Вывод результатов одного масштаба"""
+    search, query = result["search_latency_ms"], result["query_latency_ms"]
+    print(f"\n  Масштаб x{result['scale']}:")
+    print(f"    Фрагментов: {result['source_chunks']} прочитано, {result['total_chunks']} проиндексировано "
+          f"из {result['total_documents']} файлов")
+    print(f"    Схлопнуто дубликатов: {result['duplicate_chunks']} за {result['dedup_seconds']} с "
+          f"(чистая экономия на эмбеддингах ~{result['embedding_seconds_saved']} с)")
+    print(f"    Загрузка: {result['ingest_seconds']} с ({result['ingest_chunks_per_second']} фрагм./с)")
+    print(f"    Холодный старт: {result['cold_start_seconds']} с")
+    print(f"    Пиковый RSS: {result['peak_rss_mb']} МБ")
+    print(f"    Поиск, мс: p50={search['p50']} p95={search['p95']} p99={search['p99']}")
+    print(f"    Запрос, мс: p50={query['p50']} p95={query['p95']} p99={query['p99']}")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Бенчмарк производительности RAG системы")
+    parser.add_argument("--scales", default="1,10,100", help="коэффициенты масштабирования корпуса через запятую")
+    parser.add_argument("--iterations", type=int, default=5, help="сколько раз прогонять набор вопросов")
+    parser.add_argument("--warmup", type=int, default=2, help="число прогревочных запросов")
+    parser.add_argument("--queries-file", help="файл с вопросами, по одному в строке")
+    parser.add_argument("--llm-latency-ms", type=float, default=500.0, help="задержка ответа заглушки ГигаЧат, мс")
+    parser.add_argument("--llm-jitter-ms", type=float, default=0.0, help="разброс задержки заглушки, мс")
+    parser.add_argument("--seed", type=int, default=42, help="seed для генерации синтетического корпуса")
+    parser.add_argument("--output", help="путь к JSON файлу с результатами")
+    parser.add_argument("--compare", help="JSON файл предыдущего запуска для сравнения")
+    parser.add_argument("--worker", action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument("--corpus", help=argparse.SUPPRESS)
+    parser.add_argument("--worker-output", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        return run_worker(args)
+
+    from benchmarks.gigachat_stub import GigaChatStub
+    from benchmarks.synthetic_corpus import build_corpus
+
+    if not load_queries(args.queries_file):
+        parser.error("файл с вопросами пуст")
+
+    scales = [int(s) for s in args.scales.split(",") if s.strip()]
+    report = {
+        "started_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        "git_commit": _git_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "params": {
+            "scales": scales,
+            "iterations": args.iterations,
+            "warmup": args.warmup,
+            "queries": len(load_queries(args.queries_file)),
+            "llm_latency_ms": args.llm_latency_ms,
+            "llm_jitter_ms": args.llm_jitter_ms,
+            "seed": args.seed
+        },
+        "results": []
+    }
+
+    print("🚀 Бенчмарк RAG системы...")
+    with GigaChatStub(latency_ms=args.llm_latency_ms, jitter_ms=args.llm_jitter_ms, seed=args.seed) as stub:
+        print(f"🤖 Заглушка ГигаЧат: {stub.base_url} (задержка {args.llm_latency_ms} мс)")
+        for scale in scales:
+            if scale == 1:
+                corpus_dir = SOURCE_DOCUMENTS_DIR
+            else:
+                print(f"📁 Генерация корпуса x{scale}...")
+                corpus_dir = build_corpus(SOURCE_DOCUMENTS_DIR, CORPORA_DIR / f"x{scale}", scale, args.seed)
+
+            result = run_scale(scale, corpus_dir, stub, args)
+            check_scaling(result, report["results"])
+            report["results"].append(result)
+            print_result(result)
+
+    output = Path(args.output) if args.output else RESULTS_DIR / f"bench-{datetime.now():%Y%m%d-%H%M%S}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, ensure_ascii=False, indent=2), encoding="utf-8")
+    print(f"\n✅ Результаты сохранены: {output}")
+
+    if args.compare:
+        compare(json.loads(Path(args.compare).read_text(encoding="utf-8")), report)
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,68 @@
+"""
+Генерация синтетического корпуса документов для бенчмарков
+
+Корпус масштабируется из реальных файлов data/documents с сохранением
+схемы: имена файлов, заголовки, разделитель и кодировка CSV остаются
+прежними, поэтому config.FILE_MAPPING применяется без изменений.
+Первые строки каждой таблицы - исходные, остальные собираются из значений
+тех же столбцов случайных строк. Генерация детерминирована (seed).
+"""
+
+import csv
+import random
+import shutil
+from pathlib import Path
+
+from table_reader import read_table, read_text
+
+
+def scale_csv(source: Path, target: Path, scale: int, rng: random.Random):
+    """Масштабирование CSV файла в scale раз"""
+    encoding, delimiter, header, rows = read_table(source)
+    if not rows:
+        shutil.copyfile(source, target)
+        return
+
+    columns = list(zip(*rows))
+    scaled_rows = list(rows)
+    for _ in range(len(rows) * (scale - 1)):
+        scaled_rows.append([rng.choice(column) for column in columns])
+
+    with open(target, "w", encoding=encoding, newline="") as f:
+        writer = csv.writer(f, delimiter=delimiter, lineterminator="\n")
+        writer.writerow(header)
+        writer.writerows(scaled_rows)
+
+
+def scale_txt(source: Path, target: Path, scale: int, rng: random.Random):
+    """Масштабирование TXT файла: исходный текст и перемешанные копии абзацев"""
+    text, encoding = read_text(source)
+    paragraphs = [p for p in text.split("\n\n") if p.strip()]
+
+    parts = [text]
+    for _ in range(scale - 1):
+        shuffled = list(paragraphs)
+        rng.shuffle(shuffled)
+        parts.append("\n\n".join(shuffled))
+
+    target.write_text("\n\n".join(parts), encoding=encoding)
+
+
+def build_corpus(source_dir: Path, target_dir: Path, scale: int, seed: int = 42) -> Path:
+    """Сборка корпуса, увеличенного в scale раз, в директории target_dir"""
+    if scale < 1:
+        raise ValueError(f"Коэффициент масштабирования должен быть >= 1, получено {scale}")
+
+    if target_dir.exists():
+        shutil.rmtree(target_dir)
+    target_dir.mkdir(parents=True)
+
+    rng = random.Random(seed)
+    for source in sorted(source_dir.iterdir()):
+        target = target_dir / source.name
+        if source.suffix == ".csv":
+            scale_csv(source, target, scale, rng)
+        elif source.suffix == ".txt":
+            scale_txt(source, target, scale, rng)
+
+    return target_dir
@@ -25,11 +25,23 @@ CHUNK_OVERLAP = 200
 TOP_K_RETRIEVAL = 5
 SIMILARITY_THRESHOLD = 0.7
 
+# Схлопывание почти одинаковых фрагментов при загрузке
+DEDUP_ENABLED = True
+DEDUP_THRESHOLD = 0.9
+DEDUP_NUM_PERM = 64
+DEDUP_BANDS = 8
+DEDUP_SHINGLE_SIZE = 5
+# Поля CSV, значения которых не учитываются при сравнении (номера записей)
+DEDUP_IGNORED_FIELDS = ["Номер"]
+# Поля CSV с датами: в них маскируются и сокращенные даты (25.12, 11,12)
+DEDUP_DATE_FIELD_PREFIXES = ["Дата"]
+
 # Настройки эмбеддингов
 EMBEDDING_MODEL = "sentence-transformers/paraphrase-multilingual-MiniLM-L12-v2"
 
 # Настройки ГигаЧат
-GIGACHAT_BASE_URL = "https://gigachat.devices.sberbank.ru/api/v1"
+GIGACHAT_BASE_URL = os.getenv("GIGACHAT_BASE_URL", "https://gigachat.devices.sberbank.ru/api/v1")
+GIGACHAT_AUTH_URL = os.getenv("GIGACHAT_AUTH_URL", "https://ngw.devices.sberbank.ru:9443/api/v2/oauth")
 GIGACHAT_SCOPE = "GIGACHAT_API_PERS"
 
 # Логирование
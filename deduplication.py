@@ -0,0 +1,224 @@
+"""
+Поиск и схлопывание почти одинаковых фрагментов перед индексацией
+
+Строки CSV сравниваются по хэшу набора нормализованных полей
+"столбец: значение": при порядке десятка полей порог похожести
+достигается только при полном совпадении. Для текстовых фрагментов
+используется MinHash по символьным шинглам и LSH (разбиение сигнатуры
+на полосы) для поиска кандидатов, решение о схлопывании принимается
+по точному коэффициенту Жаккара. Перед сравнением из текста убираются
+поля-идентификаторы и маскируются даты, поэтому строки таблиц,
+отличающиеся только номером или датой, совпадают. Из каждой группы
+в индекс попадает первый фрагмент, остальные сохраняются ссылками
+в его метаданных, а их отличающиеся значения (номера, даты) и число
+дописываются в текст фрагмента, чтобы они оставались доступны при поиске.
+"""
+
+import hashlib
+import re
+import zlib
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+from langchain.schema import Document
+
+import config
+
+# Простое число Мерсенна 2^31 - 1: произведение a * x помещается в int64
+_PRIME = (1 << 31) - 1
+
+# Начальный размер хранилища сигнатур текстовых фрагментов
+_INITIAL_CAPACITY = 1024
+
+# Кандидаты LSH с оценкой MinHash ниже порога на эту величину не проверяются точно
+_ESTIMATE_MARGIN = 0.15
+
+_DAY = r"(?:0?[1-9]|[12]\d|3[01])"
+_MONTH = r"(?:0?[1-9]|1[0-2])"
+# Полная дата (дд.мм.гггг) маскируется в любом поле
+_FULL_DATE_RE = re.compile(rf"\b{_DAY}\.{_MONTH}\.(?:\d{{4}}|\d{{2}})\b")
+# В столбцах с датами допускаются и сокращенные формы: 25.12, 11,12
+_FIELD_DATE_RE = re.compile(rf"\b{_DAY}[./,]{_MONTH}(?:[./,](?:\d{{4}}|\d{{2}}))?\b")
+
+
+class MinHashDeduplicator:
+    def __init__(self,
+                 threshold: float = config.DEDUP_THRESHOLD,
+                 num_perm: int = config.DEDUP_NUM_PERM,
+                 bands: int = config.DEDUP_BANDS,
+                 shingle_size: int = config.DEDUP_SHINGLE_SIZE,
+                 ignored_fields: Optional[List[str]] = None,
+                 date_field_prefixes: Optional[List[str]] = None,
+                 seed: int = 1):
+        if num_perm % bands:
+            raise ValueError(f"Число перестановок {num_perm} должно делиться на число полос {bands}")
+
+        self.threshold = threshold
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows_per_band = num_perm // bands
+        self.shingle_size = shingle_size
+        self.ignored_fields = {
+            field.strip().lower()
+            for field in (config.DEDUP_IGNORED_FIELDS if ignored_fields is None else ignored_fields)
+        }
+        self.date_field_prefixes = tuple(
+            prefix.strip().lower()
+            for prefix in (config.DEDUP_DATE_FIELD_PREFIXES if date_field_prefixes is None else date_field_prefixes)
+        )
+
+        rng = np.random.RandomState(seed)
+        self._a = rng.randint(1, _PRIME, size=num_perm, dtype=np.int64)[:, None]
+        self._b = rng.randint(0, _PRIME, size=num_perm, dtype=np.int64)[:, None]
+
+    def normalize(self, text: str) -> List[str]:
+        """Нормализация текста по строкам: без полей-идентификаторов и с замаскированными датами"""
+        lines = []
+        for line in text.lower().splitlines():
+            field, sep, _ = line.partition(":")
+            field = field.strip()
+            if sep and field in self.ignored_fields:
+                continue
+            date_re = _FIELD_DATE_RE if sep and field.startswith(self.date_field_prefixes) else _FULL_DATE_RE
+            line = " ".join(date_re.sub("<дата>", line).split())
+            if line:
+                lines.append(line)
+        return lines
+
+    def shingles(self, text: str) -> set:
+        """Символьные k-граммы нормализованного текста"""
+        normalized = " ".join(self.normalize(text))
+        k = self.shingle_size
+        return {normalized[i:i + k] for i in range(max(1, len(normalized) - k + 1))} if normalized else set()
+
+    def fingerprint(self, text: str) -> Optional[bytes]:
+        """Хэш набора нормализованных полей строки таблицы или None для пустой строки"""
+        lines = sorted(set(self.normalize(text)))
+        if not lines:
+            return None
+        return hashlib.blake2b("\n".join(lines).encode("utf-8"), digest_size=16).digest()
+
+    def signature(self, text: str) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+        """MinHash сигнатура и отсортированные хэши шинглов текста или None для пустого текста"""
+        shingles = self.shingles(text)
+        if not shingles:
+            return None
+
+        hashes = np.unique(np.fromiter(
+            (zlib.crc32(s.encode("utf-8")) % _PRIME for s in shingles),
+            dtype=np.int64,
+            count=len(shingles)
+        ))
+        signature = ((self._a * hashes + self._b) % _PRIME).min(axis=1).astype(np.uint32)
+        return signature, hashes
+
+    def deduplicate(self, documents: List[Document]) -> Tuple[List[Document], int]:
+        """Схлопывание почти одинаковых документов, возвращает (оставшиеся, число удаленных)"""
+        kept: List[Document] = []
+        removed = 0
+        # Отличающиеся значения полей схлопнутых строк: индекс представителя -> поле -> значения
+        variants: Dict[int, Dict[str, List[str]]] = {}
+
+        # Строки таблиц: точное совпадение нормализованных полей
+        fingerprints: Dict[bytes, int] = {}
+
+        # Текстовые фрагменты: сигнатуры хранятся только для оставленных, строка i - i-й из них
+        signatures = np.empty((_INITIAL_CAPACITY, self.num_perm), dtype=np.uint32)
+        text_indexes: List[int] = []
+        shingle_hashes: List[np.ndarray] = []
+        buckets: Dict[Tuple[int, bytes], List[int]] = {}
+
+        for doc in documents:
+            if doc.metadata.get("file_type") == "csv":
+                key = self.fingerprint(doc.page_content)
+                if key is not None and key in fingerprints:
+                    self._attach_duplicate(kept[fingerprints[key]], doc, variants.setdefault(fingerprints[key], {}))
+                    removed += 1
+                    continue
+                if key is not None:
+                    fingerprints[key] = len(kept)
+                kept.append(doc)
+                continue
+
+            result = self.signature(doc.page_content)
+            if result is None:
+                kept.append(doc)
+                continue
+            sig, hashes = result
+
+            band_keys = [
+                (band, sig[band * self.rows_per_band:(band + 1) * self.rows_per_band].tobytes())
+                for band in range(self.bands)
+            ]
+
+            match = self._find_match(sig, hashes, band_keys, buckets, signatures, shingle_hashes)
+            if match is not None:
+                self._attach_duplicate(kept[text_indexes[match]], doc, variants.setdefault(text_indexes[match], {}))
+                removed += 1
+                continue
+
+            position = len(text_indexes)
+            if position == len(signatures):
+                signatures = np.concatenate([signatures, np.empty_like(signatures)])
+            signatures[position] = sig
+            shingle_hashes.append(hashes)
+            text_indexes.append(len(kept))
+            kept.append(doc)
+            for key in band_keys:
+                buckets.setdefault(key, []).append(position)
+
+        for index, fields in variants.items():
+            self._append_summary(kept[index], fields)
+
+        return kept, removed
+
+    def _find_match(self, sig: np.ndarray, hashes: np.ndarray, band_keys: List[Tuple[int, bytes]],
+                    buckets: Dict[Tuple[int, bytes], List[int]],
+                    signatures: np.ndarray, shingle_hashes: List[np.ndarray]) -> Optional[int]:
+        """Поиск представителя группы с точным коэффициентом Жаккара не меньше порога"""
+        candidates = set()
+        for key in band_keys:
+            candidates.update(buckets.get(key, ()))
+        if not candidates:
+            return None
+
+        candidates = np.fromiter(candidates, dtype=np.int64, count=len(candidates))
+        estimates = (signatures[candidates] == sig).mean(axis=1)
+
+        # Оценка MinHash лишь отбирает кандидатов, решение принимается по точному значению
+        for position in np.argsort(-estimates):
+            if estimates[position] < self.threshold - _ESTIMATE_MARGIN:
+                break
+            index = int(candidates[position])
+            if self._jaccard(hashes, shingle_hashes[index]) >= self.threshold:
+                return index
+        return None
+
+    @staticmethod
+    def _jaccard(a: np.ndarray, b: np.ndarray) -> float:
+        """Коэффициент Жаккара двух множеств уникальных хэшей шинглов"""
+        intersection = len(np.intersect1d(a, b, assume_unique=True))
+        return intersection / (len(a) + len(b) - intersection)
+
+    @staticmethod
+    def _attach_duplicate(representative: Document, duplicate: Document, fields: Dict[str, List[str]]):
+        """Сохранение ссылки на схлопнутый фрагмент и его отличающихся значений"""
+        metadata = duplicate.metadata
+        position = metadata.get("row_index", metadata.get("chunk_index"))
+        duplicates = representative.metadata.setdefault("duplicates", [])
+        duplicates.append(f"{metadata.get('file_name', 'unknown')}#{position}")
+        representative.metadata["duplicates_count"] = len(duplicates)
+
+        representative_lines = set(representative.page_content.splitlines())
+        for line in duplicate.page_content.splitlines():
+            field, sep, value = line.partition(":")
+            if sep and line not in representative_lines and value.strip():
+                fields.setdefault(field.strip(), []).append(value.strip())
+
+    @staticmethod
+    def _append_summary(representative: Document, fields: Dict[str, List[str]]):
+        """Дописывание в текст представителя числа и отличающихся значений схлопнутых записей"""
+        lines = [f"Аналогичных записей: {representative.metadata['duplicates_count']}"]
+        for field, values in fields.items():
+            lines.append(f"{field} в аналогичных записях: {', '.join(dict.fromkeys(values))}")
+        representative.page_content = "\n".join([representative.page_content] + lines)
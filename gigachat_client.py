@@ -14,6 +14,7 @@ class GigaChatClient:
     def __init__(self):
         self.token = config.GIGACHAT_TOKEN
         self.base_url = config.GIGACHAT_BASE_URL
+        self.auth_url = config.GIGACHAT_AUTH_URL
         self.scope = config.GIGACHAT_SCOPE
         self.access_token = None
 
@@ -22,7 +23,7 @@ class GigaChatClient:
         try:
             async with httpx.AsyncClient() as client:
                 response = await client.post(
-                    "https://ngw.devices.sberbank.ru:9443/api/v2/oauth",
+                    self.auth_url,
                     headers={
                         "Content-Type": "application/x-www-form-urlencoded",
                         "Accept": "application/json",
@@ -66,6 +66,7 @@ class TelegramRAGBot:
             f"📊 Статистика базы знаний\n\n"
             f"Всего документов: {stats['total_documents']}\n"
             f"Всего фрагментов: {stats['total_chunks']}\n"
+            f"Схлопнуто дубликатов: {stats['duplicate_chunks']}\n"
             f"Последнее обновление: {stats['last_updated']}"
         )
 
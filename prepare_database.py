@@ -43,6 +43,9 @@ async def main():
         print(f"📊 Статистика:")
         print(f"  - Обработано файлов: {stats['total_documents']}")
         print(f"  - Создано фрагментов: {stats['total_chunks']}")
+        print(f"  - Схлопнуто дубликатов: {stats['duplicate_chunks']} из {stats['source_chunks']}")
+        print(f"  - Поиск дубликатов: {stats['dedup_seconds']:.1f} с")
+        print(f"  - Чистая экономия на эмбеддингах: ~{stats['embedding_seconds_saved']:.1f} с")
         print(f"  - Время обновления: {stats['last_updated']}")
 
     except Exception as e:
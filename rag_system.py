@@ -4,6 +4,7 @@ RAG система с использованием Ragbits и интеграци
 
 import asyncio
 import logging
+import time
 from datetime import datetime
 from pathlib import Path
 from typing import List, Dict, Any, Optional
@@ -23,6 +24,8 @@ from langchain.schema import Document
 
 import config
 from gigachat_client import GigaChatClient
+from deduplication import MinHashDeduplicator
+from table_reader import read_table
 
 logger = logging.getLogger(__name__)
 
@@ -32,11 +35,19 @@ class RAGSystem:
         self.vector_store = None  
         self.document_search = None
         self.llm_client = GigaChatClient()
+        self.deduplicator = MinHashDeduplicator() if config.DEDUP_ENABLED else None
         self.is_initialized = False
         self.stats = {
             "total_documents": 0,
             "total_chunks": 0, 
-            "last_updated": None
+            "last_updated": None,
+            "ingest_seconds": 0.0,
+            "index_seconds": 0.0,
+            "csv_chunks": 0,
+            "source_chunks": 0,
+            "duplicate_chunks": 0,
+            "dedup_seconds": 0.0,
+            "embedding_seconds_saved": 0.0
         }
 
     async def initialize(self):
@@ -70,6 +81,7 @@ class RAGSystem:
 
     async def load_documents(self):
         """Загрузка и индексация всех документов"""
+        started = time.perf_counter()
         documents = []
 
         # Обрабатываем CSV файлы
@@ -82,6 +94,8 @@ class RAGSystem:
             except Exception as e:
                 logger.error(f"Ошибка загрузки {csv_file}: {e}")
 
+        csv_chunks = len(documents)
+
         # Обрабатываем TXT файлы
         txt_files = list(config.DOCUMENTS_DIR.glob("*.txt"))  
         for txt_file in txt_files:
@@ -92,22 +106,48 @@ class RAGSystem:
             except Exception as e:
                 logger.error(f"Ошибка загрузки {txt_file}: {e}")
 
+        # Схлопываем почти одинаковые фрагменты
+        source_chunks = len(documents)
+        duplicates = 0
+        dedup_started = time.perf_counter()
+        if self.deduplicator and documents:
+            documents, duplicates = self.deduplicator.deduplicate(documents)
+        dedup_seconds = time.perf_counter() - dedup_started
+
         # Индексируем документы
+        index_started = time.perf_counter()
         if documents:
             await self._index_documents(documents)
+        index_seconds = time.perf_counter() - index_started
 
         # Обновляем статистику
         self.stats["total_documents"] = len(csv_files) + len(txt_files)
         self.stats["total_chunks"] = len(documents)
         self.stats["last_updated"] = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        self.stats["ingest_seconds"] = time.perf_counter() - started
+        self.stats["index_seconds"] = index_seconds
+        self.stats["csv_chunks"] = csv_chunks
+        self.stats["source_chunks"] = source_chunks
+        self.stats["duplicate_chunks"] = duplicates
+        self.stats["dedup_seconds"] = dedup_seconds
+        # Оценка по среднему времени индексации одного фрагмента за вычетом времени поиска дубликатов
+        gross_saved = index_seconds / len(documents) * duplicates if documents else 0.0
+        self.stats["embedding_seconds_saved"] = gross_saved - dedup_seconds
 
         logger.info(f"Загружено {len(documents)} фрагментов из {self.stats['total_documents']} файлов")
+        if duplicates:
+            logger.info(
+                f"Схлопнуто дубликатов: {duplicates}, "
+                f"поиск дубликатов {dedup_seconds:.1f} с, "
+                f"чистая экономия на эмбеддингах ~{self.stats['embedding_seconds_saved']:.1f} с"
+            )
 
     async def _process_csv_file(self, file_path: Path) -> List[Document]:
         """Обработка CSV файла"""
         try:
-            # Читаем CSV
-            df = pd.read_csv(file_path, encoding='utf-8')
+            # Читаем CSV с определением кодировки и разделителя
+            _, _, header, rows = read_table(file_path)
+            df = pd.DataFrame(rows, columns=header).replace("", pd.NA)
 
             # Получаем метаданные файла
             file_info = config.FILE_MAPPING.get(file_path.name, {
@@ -0,0 +1,51 @@
+"""
+Чтение CSV таблиц с определением кодировки и разделителя
+
+Файлы в data/documents выгружаются из разных таблиц: разделитель бывает
+";" или ",", кодировка - utf-8 или cp1251, а перед заголовком может идти
+строка с названием таблицы. Заголовком считается первая строка,
+в которой заполнено больше одного поля.
+"""
+
+import csv
+from pathlib import Path
+from typing import List, Tuple
+
+CSV_DELIMITERS = ";,\t"
+CSV_ENCODINGS = ("utf-8", "cp1251")
+
+
+def read_text(file_path: Path) -> Tuple[str, str]:
+    """Чтение файла с подбором кодировки, возвращает (текст, кодировка)"""
+    raw = file_path.read_bytes()
+    for encoding in CSV_ENCODINGS:
+        try:
+            return raw.decode(encoding), encoding
+        except UnicodeDecodeError:
+            continue
+    return raw.decode("utf-8", errors="replace"), "utf-8"
+
+
+def read_table(file_path: Path) -> Tuple[str, str, List[str], List[List[str]]]:
+    """Чтение CSV файла: кодировка, разделитель, заголовок и строки"""
+    text, encoding = read_text(file_path)
+    try:
+        delimiter = csv.Sniffer().sniff(text[:4096], delimiters=CSV_DELIMITERS).delimiter
+    except csv.Error:
+        delimiter = ";"
+
+    rows = [row for row in csv.reader(text.splitlines(), delimiter=delimiter) if any(c.strip() for c in row)]
+
+    # Пропускаем строки с названием таблицы перед заголовком
+    start = 0
+    while start < len(rows) - 1 and sum(1 for c in rows[start] if c.strip()) < 2:
+        start += 1
+    if start >= len(rows):
+        return encoding, delimiter, [], []
+
+    header, body = [c.strip() for c in rows[start]], rows[start + 1:]
+    width = max([len(header)] + [len(row) for row in body])
+    header += [f"Столбец {i + 1}" for i in range(len(header), width)]
+    header = [name or f"Столбец {i + 1}" for i, name in enumerate(header)]
+    body = [row + [""] * (width - len(row)) for row in body]
+    return encoding, delimiter, header, body